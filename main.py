@@ -2,51 +2,82 @@
 Algoritmo A* melhorado para encontrar o menor caminho em um labirinto 2D.
 
 Melhorias:
-- Tie-break por (f, h) na heap para desempate mais "informado".
+- Tie-break por (f, -g) na heap: em empate de f, expande primeiro o nó com
+  maior g (mais perto do objetivo), reduzindo expansões em platôs de f.
 - Verificação rigorosa de exatamente 1 'S' (start) e 1 'E' (end).
 - g_score (sem varrer heap para atualizar nós).
 - Suporte opcional a movimentos diagonais (8 direções) com heurística Octile.
 - Suporte a terrenos com peso (células '2'..'9' multiplicam o custo do passo).
 - Impressão alinhada do labirinto e exibição do custo total.
 - Compatível com o formato anterior: 'S', 'E', '0' (livre), '1' ou '#' (obstáculo).
+- Labirinto codificado uma única vez em arrays NumPy (obstáculos uint8 e
+  pesos uint8) antes da busca.
+- Núcleo da busca compilado com Numba (@njit).
 """
 
-import heapq
+import importlib
+import importlib.util
 import math
-from typing import List, Tuple, Optional, Dict, Iterable
+import re
+from typing import List, Tuple, Optional
 
+import numpy as np
+from numba import njit
+
+# Visualização opcional: view_curses só importa curses ao animar, então aqui
+# basta checar se a extensão _curses existe (sem carregá-la).
+run_curses_animation = None  # sem curses disponível
 try:
-    from .view_curses import run_curses_animation  # tipo: ignore
-except Exception:
-    try:
-        from view_curses import run_curses_animation  # fallback quando exec direto
-    except Exception:
-        run_curses_animation = None  # sem curses disponível
+    if importlib.util.find_spec("_curses") is not None:
+        # Relativo ao pacote quando importado como pacote; senão execução direta
+        _view_name = ".view_curses" if __package__ else "view_curses"
+        _view = importlib.import_module(_view_name, __package__)
+        run_curses_animation = getattr(_view, "run_curses_animation", None)
+except ImportError:
+    pass
 
 
 Pos = Tuple[int, int]
 
+# Deslocamentos (di, dj) da vizinhança: 4 ortogonais seguidos das 4 diagonais.
+_NEIGH4 = np.array([[-1, 0], [1, 0], [0, -1], [0, 1]], dtype=np.int8)
+_NEIGH8 = np.concatenate(
+    (_NEIGH4, np.array([[-1, -1], [-1, 1], [1, -1], [1, 1]], dtype=np.int8))
+)
+_SQRT2 = math.sqrt(2)
 
-def is_obstacle(cell: str) -> bool:
-    """Define o que é obstáculo."""
-    return cell in ("1", "#")
+# Entrada do usuário: células válidas e linha inteira (células separadas por espaço)
+_TOKEN_RE = re.compile(r"[SE0-9#]")
+_LINE_RE = re.compile(r"\s*(?:[SE0-9#](?:\s+[SE0-9#])*)?\s*")
 
 
-def cell_weight(cell: str) -> float:
+def _raw_grid(lab: List[List[str]]) -> np.ndarray:
     """
-    Retorna o peso multiplicativo do terreno:
-    - '0', 'S', 'E' => 1.0
-    - '2'..'9' => peso numérico
-    - Qualquer outra coisa tratada como 1.0 (desde que não seja obstáculo)
+    Converte o labirinto em um array uint8 (H, W) com o código ASCII de cada
+    célula, numa única passada em C (join + frombuffer).
+    Levanta ValueError se as linhas tiverem tamanhos diferentes ou alguma
+    célula não for um único caractere (não-ASCII vira '?', célula livre).
     """
-    if cell in ("S", "E", "0"):
-        return 1.0
-    if cell.isdigit():
-        v = int(cell)
-        if v >= 2:
-            return float(v)
-        return 1.0
-    return 1.0
+    if not lab:
+        return np.zeros((0, 0), dtype=np.uint8)
+    H, W = len(lab), len(lab[0])
+    if any(len(row) != W or any(len(c) != 1 for c in row) for row in lab):
+        raise ValueError("Labirinto deve ser retangular, com 1 caractere por célula")
+    data = "".join("".join(row) for row in lab).encode("ascii", errors="replace")
+    return np.frombuffer(data, dtype=np.uint8).reshape(H, W)
+
+
+def _unique_positions(raw: np.ndarray) -> Tuple[Pos, Pos]:
+    """Localiza 'S' e 'E' em `_raw_grid` (np.argwhere) e valida unicidade."""
+    starts = np.argwhere(raw == ord("S"))
+    ends = np.argwhere(raw == ord("E"))
+
+    if starts.shape[0] != 1:
+        raise ValueError(f"Esperado exatamente 1 'S', encontrado: {starts.shape[0]}")
+    if ends.shape[0] != 1:
+        raise ValueError(f"Esperado exatamente 1 'E', encontrado: {ends.shape[0]}")
+
+    return (int(starts[0, 0]), int(starts[0, 1])), (int(ends[0, 0]), int(ends[0, 1]))
 
 
 def find_unique_positions(lab: List[List[str]]) -> Tuple[Pos, Pos]:
@@ -54,54 +85,40 @@ def find_unique_positions(lab: List[List[str]]) -> Tuple[Pos, Pos]:
     Encontra e valida que exista exatamente 1 'S' e 1 'E'.
     Levanta ValueError se não cumprir.
     """
-    starts: List[Pos] = []
-    ends: List[Pos] = []
-    for i, row in enumerate(lab):
-        for j, c in enumerate(row):
-            if c == "S":
-                starts.append((i, j))
-            elif c == "E":
-                ends.append((i, j))
-
-    if len(starts) != 1:
-        raise ValueError(f"Esperado exatamente 1 'S', encontrado: {len(starts)}")
-    if len(ends) != 1:
-        raise ValueError(f"Esperado exatamente 1 'E', encontrado: {len(ends)}")
-
-    return starts[0], ends[0]
-
-
-def neighbors_4(pos: Pos) -> Iterable[Pos]:
-    i, j = pos
-    yield (i - 1, j)
-    yield (i + 1, j)
-    yield (i, j - 1)
-    yield (i, j + 1)
-
+    return _unique_positions(_raw_grid(lab))
 
-def neighbors_8(pos: Pos) -> Iterable[Pos]:
-    i, j = pos
-    # ortogonais
-    yield (i - 1, j)
-    yield (i + 1, j)
-    yield (i, j - 1)
-    yield (i, j + 1)
-    # diagonais
-    yield (i - 1, j - 1)
-    yield (i - 1, j + 1)
-    yield (i + 1, j - 1)
-    yield (i + 1, j + 1)
 
-
-def in_bounds(lab: List[List[str]], pos: Pos) -> bool:
-    i, j = pos
-    return 0 <= i < len(lab) and 0 <= j < len(lab[0])
+def encode_lab(
+    lab: List[List[str]]
+) -> Tuple[np.ndarray, np.ndarray, Pos, Pos]:
+    """
+    Codifica o labirinto de strings em arrays contíguos (a partir de
+    `_raw_grid`); é a única definição das regras de célula:
+      - obstacle: uint8 (H+2, W+2), 1 para '1'/'#' e 0 caso contrário
+      - weight: uint8 (H+2, W+2), peso do terreno ('2'..'9' => v; '0', 'S',
+        'E' e demais células livres => 1)
+    Os arrays têm uma borda de obstáculos (sentinela), então os kernels não
+    precisam testar limites; a célula (i, j) do labirinto vira (i+1, j+1).
+    Retorna (obstacle, weight, start, goal), com start/goal já deslocados.
+    Levanta ValueError se S/E inválidos.
+    """
+    raw = _raw_grid(lab)
+    start, goal = _unique_positions(raw)
+    H, W = raw.shape
+    obstacle = np.ones((H + 2, W + 2), dtype=np.uint8)
+    obstacle[1:-1, 1:-1] = (raw == ord("1")) | (raw == ord("#"))
+    heavy = (raw >= ord("2")) & (raw <= ord("9"))
+    weight = np.ones((H + 2, W + 2), dtype=np.uint8)
+    weight[1:-1, 1:-1] = np.where(heavy, raw - ord("0"), 1)
+    return obstacle, weight, (start[0] + 1, start[1] + 1), (goal[0] + 1, goal[1] + 1)
 
 
+@njit(cache=True)
 def manhattan(a: Pos, b: Pos) -> float:
     return abs(a[0] - b[0]) + abs(a[1] - b[1])
 
 
+@njit(cache=True)
 def octile(a: Pos, b: Pos) -> float:
     """
     Heurística Octile (admissível para 8 direções):
@@ -109,92 +126,801 @@ def octile(a: Pos, b: Pos) -> float:
     """
     dx = abs(a[0] - b[0])
     dy = abs(a[1] - b[1])
-    return (math.sqrt(2) - 1) * min(dx, dy) + max(dx, dy)
+    return (_SQRT2 - 1) * min(dx, dy) + max(dx, dy)
 
 
-def movement_cost(from_pos: Pos, to_pos: Pos, lab: List[List[str]]) -> float:
+@njit(cache=True)
+def _heuristic(i, j, idx, gy, gx, goal, allow_diag, lm_from, lm_to):
     """
-    Custo base do passo:
-      - 1.0 para ortogonais
-      - sqrt(2) para diagonais
-    Multiplicado pelo peso do terreno da célula de destino.
+    Heurística do kernel para a célula (i, j) de índice plano `idx`:
+    Manhattan/Octile combinada (max) com os limites ALT de cada landmark L
+    (desigualdade triangular no grafo dirigido):
+      d(v, E) >= d(L, E) - d(L, v)   e   d(v, E) >= d(v, L) - d(E, L)
+    `lm_from`/`lm_to` têm forma (k, H*W); com k = 0 fica só a heurística base.
     """
-    di = abs(to_pos[0] - from_pos[0])
-    dj = abs(to_pos[1] - from_pos[1])
-    base = math.sqrt(2) if di == 1 and dj == 1 else 1.0
-    dest_cell = lab[to_pos[0]][to_pos[1]]
-    return base * cell_weight(dest_cell)
+    if allow_diag:
+        h = octile((i, j), (gy, gx))
+    else:
+        h = float(manhattan((i, j), (gy, gx)))
+    for l in range(lm_from.shape[0]):
+        # d(L, v) ou d(E, L) infinito não dá limite (inf - inf), só se pula
+        if lm_from[l, idx] < np.inf:
+            t = lm_from[l, goal] - lm_from[l, idx]
+            if t > h:
+                h = t
+        if lm_to[l, goal] < np.inf:
+            t = lm_to[l, idx] - lm_to[l, goal]
+            if t > h:
+                h = t
+    return h
 
 
-def reconstruct_path(came_from: Dict[Pos, Pos], current: Pos) -> List[Pos]:
-    path = [current]
-    while current in came_from:
-        current = came_from[current]
-        path.append(current)
-    path.reverse()
+@njit(cache=True)
+def reconstruct_path(came_from: np.ndarray, current: int, W: int) -> np.ndarray:
+    """
+    Reconstrói o caminho a partir de `came_from` (array plano com o índice
+    do pai, -1 na origem). Retorna array int32 (n, 2) de coordenadas, de S
+    até `current`.
+    """
+    n = 1
+    node = current
+    while came_from[node] != -1:
+        node = came_from[node]
+        n += 1
+    path = np.empty((n, 2), dtype=np.int32)
+    node = current
+    for k in range(n - 1, -1, -1):
+        path[k, 0] = node // W
+        path[k, 1] = node % W
+        node = came_from[node]
     return path
 
 
-def a_star(
-    lab: List[List[str]],
-    allow_diagonals: bool = False
-) -> Optional[Tuple[List[Pos], float]]:
+@njit(cache=True)
+def _neighbor_deltas(W):
+    """Deslocamentos de `_NEIGH8` convertidos em deltas de índice plano."""
+    return _NEIGH8[:, 0].astype(np.int32) * W + _NEIGH8[:, 1]
+
+
+@njit(cache=True, inline="always")
+def _heap_before(f1, g1, f2, g2):
+    """Ordem da heap: menor f; em empate, maior g (nó mais perto do objetivo)."""
+    return f1 < f2 or (f1 == f2 and g1 > g2)
+
+
+@njit(cache=True, inline="always")
+def _heap_push(heap_f, heap_g, heap_pos, size, f, g, pos):
+    """Insere (f, g, pos) na heap binária mínima; retorna o novo tamanho."""
+    i = size
+    while i > 0:
+        parent = (i - 1) >> 1
+        if not _heap_before(f, g, heap_f[parent], heap_g[parent]):
+            break
+        heap_f[i] = heap_f[parent]
+        heap_g[i] = heap_g[parent]
+        heap_pos[i] = heap_pos[parent]
+        i = parent
+    heap_f[i] = f
+    heap_g[i] = g
+    heap_pos[i] = pos
+    return size + 1
+
+
+@njit(cache=True, inline="always")
+def _heap_pop(heap_f, heap_g, heap_pos, size):
+    """Remove o topo da heap; retorna (f, pos, novo_tamanho)."""
+    f = heap_f[0]
+    pos = heap_pos[0]
+    size -= 1
+    last_f = heap_f[size]
+    last_g = heap_g[size]
+    last_pos = heap_pos[size]
+    i = 0
+    while True:
+        child = 2 * i + 1
+        if child >= size:
+            break
+        if child + 1 < size and _heap_before(
+            heap_f[child + 1], heap_g[child + 1], heap_f[child], heap_g[child]
+        ):
+            child += 1
+        if not _heap_before(heap_f[child], heap_g[child], last_f, last_g):
+            break
+        heap_f[i] = heap_f[child]
+        heap_g[i] = heap_g[child]
+        heap_pos[i] = heap_pos[child]
+        i = child
+    heap_f[i] = last_f
+    heap_g[i] = last_g
+    heap_pos[i] = last_pos
+    return f, pos, size
+
+
+@njit(cache=True)
+def _grow(arr):
+    """Dobra a capacidade de um array 1D, copiando as entradas existentes."""
+    n = arr.shape[0]
+    new = np.empty(2 * n, dtype=arr.dtype)
+    new[:n] = arr
+    return new
+
+
+@njit(cache=True, inline="always")
+def _astar_kernel(obstacle, weight, W, start, goal, allow_diag, lm_from, lm_to):
     """
-    A* com:
-      - Heurística: Manhattan (4-dir) ou Octile (8-dir).
-      - g_score com heap; evita varrer heap para updates.
-      - Suporte a pesos em '2'..'9'.
-    Retorna (caminho, custo_total) ou None.
+    Kernel do A* sobre o grid codificado, achatado em arrays 1D de H*W
+    células: posições (start, goal, heap, `came_from`) são índices planos
+    i * W + j. A borda sentinela de `encode_lab` dispensa testes de limite:
+    basta `obstacle[nb]`. Sem conjunto fechado: entradas obsoletas da heap (f maior
+    que g_score + h atual) são descartadas ao sair.
+    `lm_from`/`lm_to` são as distâncias de/para landmarks (ver `_heuristic`).
+    Retorna (caminho int32 (n, 2), custo); caminho vazio se não houver solução.
     """
-    start, goal = find_unique_positions(lab)
+    N = obstacle.shape[0]
+    n_neigh = 8 if allow_diag else 4
+    delta = _neighbor_deltas(W)
+    gy = goal // W
+    gx = goal % W
 
-    # Caso trivial: S == E
-    if start == goal:
-        return [start], 0.0
+    g_score = np.full(N, np.inf, dtype=np.float32)
+    came_from = np.full(N, -1, dtype=np.int32)
+    heap_f = np.empty(N + 1, dtype=np.float32)
+    heap_g = np.empty(N + 1, dtype=np.float32)
+    heap_pos = np.empty(N + 1, dtype=np.int32)
 
-    neigh_fn = neighbors_8 if allow_diagonals else neighbors_4
-    heuristic = octile if allow_diagonals else manhattan
+    g_score[start] = 0.0
+    h0 = _heuristic(
+        start // W, start % W, start, gy, gx, goal, allow_diag, lm_from, lm_to
+    )
+    size = _heap_push(
+        heap_f, heap_g, heap_pos, 0, np.float32(h0), np.float32(0.0), start
+    )
 
-    # g_score e estruturas
-    g_score: Dict[Pos, float] = {start: 0.0}
-    came_from: Dict[Pos, Pos] = {}
+    while size > 0:
+        f, current, size = _heap_pop(heap_f, heap_g, heap_pos, size)
+        ci = current // W
+        cj = current - ci * W
 
-    # Heap de (f, h, seq, pos) — tie-break por h; seq evita empate total
-    open_heap: List[Tuple[float, float, int, Pos]] = []
-    seq = 0
-    h0 = heuristic(start, goal)
-    heapq.heappush(open_heap, (h0, h0, seq, start))
+        h = _heuristic(ci, cj, current, gy, gx, goal, allow_diag, lm_from, lm_to)
+        if f > np.float32(g_score[current] + h):
+            continue
 
-    closed: set[Pos] = set()
+        if current == goal:
+            return reconstruct_path(came_from, current, W), float(g_score[current])
 
-    while open_heap:
-        _, _, _, current = heapq.heappop(open_heap)
+        for k in range(n_neigh):
+            nb = current + delta[k]
+            if obstacle[nb]:
+                continue
 
-        if current in closed:
+            base = _SQRT2 if k >= 4 else 1.0
+            tentative_g = np.float32(g_score[current] + base * weight[nb])
+            if tentative_g < g_score[nb]:
+                came_from[nb] = current
+                g_score[nb] = tentative_g
+                ni = ci + _NEIGH8[k, 0]
+                nj = cj + _NEIGH8[k, 1]
+                h = _heuristic(ni, nj, nb, gy, gx, goal, allow_diag, lm_from, lm_to)
+                if size == heap_f.shape[0]:
+                    heap_f = _grow(heap_f)
+                    heap_g = _grow(heap_g)
+                    heap_pos = _grow(heap_pos)
+                size = _heap_push(
+                    heap_f, heap_g, heap_pos, size,
+                    np.float32(tentative_g + h), tentative_g, nb,
+                )
+
+    return np.empty((0, 2), dtype=np.int32), np.inf
+
+
+@njit(cache=True)
+def _astar_njit_4(obstacle, weight, W, start, goal, lm_from, lm_to):
+    """`_astar_kernel` em 4 direções: allow_diag constante na compilação."""
+    return _astar_kernel(obstacle, weight, W, start, goal, False, lm_from, lm_to)
+
+
+@njit(cache=True)
+def _astar_njit_8(obstacle, weight, W, start, goal, lm_from, lm_to):
+    """`_astar_kernel` em 8 direções: allow_diag constante na compilação."""
+    return _astar_kernel(obstacle, weight, W, start, goal, True, lm_from, lm_to)
+
+
+@njit(cache=True)
+def _dijkstra_njit(obstacle, weight, W, source, allow_diag, reverse):
+    """
+    Dijkstra a partir do índice plano `source` sobre todo o grid achatado.
+    reverse=False: distâncias d(origem, v); reverse=True: d(v, origem)
+    (o passo real vai do vizinho para o nó atual, pagando o peso do atual).
+    Retorna float32 (H*W,) com inf nas células inalcançáveis.
+    """
+    N = obstacle.shape[0]
+    n_neigh = 8 if allow_diag else 4
+    delta = _neighbor_deltas(W)
+
+    dist = np.full(N, np.inf, dtype=np.float32)
+    heap_d = np.empty(N + 1, dtype=np.float32)
+    heap_pos = np.empty(N + 1, dtype=np.int32)
+
+    dist[source] = 0.0
+    zero = np.float32(0.0)
+    # Sem heurística a chave de desempate é a própria distância (heap_d duas vezes)
+    size = _heap_push(heap_d, heap_d, heap_pos, 0, zero, zero, source)
+
+    while size > 0:
+        d, current, size = _heap_pop(heap_d, heap_d, heap_pos, size)
+        if d > dist[current]:
+            continue
+
+        for k in range(n_neigh):
+            nb = current + delta[k]
+            if obstacle[nb]:
+                continue
+
+            base = _SQRT2 if k >= 4 else 1.0
+            w = weight[current] if reverse else weight[nb]
+            nd = np.float32(d + base * w)
+            if nd < dist[nb]:
+                dist[nb] = nd
+                if size == heap_d.shape[0]:
+                    heap_d = _grow(heap_d)
+                    heap_pos = _grow(heap_pos)
+                size = _heap_push(heap_d, heap_d, heap_pos, size, nd, nd, nb)
+
+    return dist
+
+
+@njit(cache=True)
+def _astar_buckets_njit(obstacle, W, start, goal):
+    """
+    A* para 4 direções com custo 1 em todos os passos (sem pesos): f é
+    inteiro, então a heap vira uma fila de baldes (Dial) indexada por f,
+    com push/pop O(1). Cada balde é uma lista encadeada (LIFO) em arrays.
+    Grid achatado e posições em índice plano, como em `_astar_kernel`.
+    Retorna (caminho int32 (n, 2), custo); caminho vazio se não houver solução.
+    """
+    N = obstacle.shape[0]
+    H = N // W
+    delta = _neighbor_deltas(W)
+    gy = goal // W
+    gx = goal % W
+    unreached = np.iinfo(np.int32).max
+
+    g_score = np.full(N, unreached, dtype=np.int32)
+    came_from = np.full(N, -1, dtype=np.int32)
+    # f <= g + h < H*W + H + W
+    bucket_head = np.full(N + H + W, -1, dtype=np.int32)
+    entry_next = np.empty(N + 1, dtype=np.int32)
+    entry_pos = np.empty(N + 1, dtype=np.int32)
+
+    g_score[start] = 0
+    cur_f = manhattan((start // W, start % W), (gy, gx))
+    entry_pos[0] = start
+    entry_next[0] = -1
+    bucket_head[cur_f] = 0
+    n_entries = 1
+    pending = 1
+
+    while pending > 0:
+        while bucket_head[cur_f] == -1:
+            cur_f += 1
+        e = bucket_head[cur_f]
+        bucket_head[cur_f] = entry_next[e]
+        pending -= 1
+        current = entry_pos[e]
+        ci = current // W
+        cj = current - ci * W
+
+        if cur_f > g_score[current] + manhattan((ci, cj), (gy, gx)):
             continue
-        closed.add(current)
 
         if current == goal:
-            path = reconstruct_path(came_from, current)
-            return path, g_score[current]
+            return reconstruct_path(came_from, current, W), float(g_score[current])
 
-        for nb in neigh_fn(current):
-            if not in_bounds(lab, nb):
-                continue
-            cell = lab[nb[0]][nb[1]]
-            if is_obstacle(cell):
+        tentative_g = g_score[current] + 1
+        for k in range(4):
+            nb = current + delta[k]
+            if obstacle[nb]:
                 continue
 
-            tentative_g = g_score[current] + movement_cost(current, nb, lab)
-            if tentative_g < g_score.get(nb, float("inf")):
+            if tentative_g < g_score[nb]:
                 came_from[nb] = current
                 g_score[nb] = tentative_g
-                h = heuristic(nb, goal)
-                f = tentative_g + h
-                seq += 1
-                heapq.heappush(open_heap, (f, h, seq, nb))
+                f = tentative_g + manhattan(
+                    (ci + _NEIGH4[k, 0], cj + _NEIGH4[k, 1]), (gy, gx)
+                )
+                if n_entries == entry_pos.shape[0]:
+                    entry_pos = _grow(entry_pos)
+                    entry_next = _grow(entry_next)
+                entry_pos[n_entries] = nb
+                entry_next[n_entries] = bucket_head[f]
+                bucket_head[f] = n_entries
+                n_entries += 1
+                pending += 1
+
+    return np.empty((0, 2), dtype=np.int32), np.inf
+
+
+@njit(cache=True)
+def _jump_straight(obstacle, W, node, di, dj, goal):
+    """
+    Avança de `node` na direção ortogonal (di, dj) até um obstáculo (-1),
+    o objetivo ou um ponto de salto: célula com vizinho forçado (lateral
+    bloqueada e a diagonal à frente livre). A borda sentinela encerra a
+    varredura, então não há teste de limites.
+    """
+    step = di * W + dj
+    side = 1 if di != 0 else W
+    while True:
+        if obstacle[node]:
+            return -1
+        if node == goal:
+            return node
+        if (obstacle[node + side] and not obstacle[node + side + step]) or (
+            obstacle[node - side] and not obstacle[node - side + step]
+        ):
+            return node
+        node += step
+
+
+@njit(cache=True)
+def _jump_diagonal(obstacle, W, node, di, dj, goal):
+    """
+    Avança de `node` na diagonal (di, dj) até um obstáculo (-1), o objetivo
+    ou um ponto de salto: célula com vizinho forçado ou da qual um salto
+    ortogonal (di, 0) ou (0, dj) alcança um ponto de salto.
+    """
+    step = di * W + dj
+    while True:
+        if obstacle[node]:
+            return -1
+        if node == goal:
+            return node
+        if (not obstacle[node + di * W - dj] and obstacle[node - dj]) or (
+            not obstacle[node - di * W + dj] and obstacle[node - di * W]
+        ):
+            return node
+        if (
+            _jump_straight(obstacle, W, node + dj, 0, dj, goal) != -1
+            or _jump_straight(obstacle, W, node + di * W, di, 0, goal) != -1
+        ):
+            return node
+        node += step
+
+
+@njit(cache=True)
+def _expand_jumps(jumps):
+    """Interpola as retas entre pontos de salto consecutivos (célula a célula)."""
+    n = 1
+    for k in range(1, jumps.shape[0]):
+        n += max(
+            abs(jumps[k, 0] - jumps[k - 1, 0]), abs(jumps[k, 1] - jumps[k - 1, 1])
+        )
+    path = np.empty((n, 2), dtype=np.int32)
+    path[0] = jumps[0]
+    p = 1
+    for k in range(1, jumps.shape[0]):
+        di = np.sign(jumps[k, 0] - jumps[k - 1, 0])
+        dj = np.sign(jumps[k, 1] - jumps[k - 1, 1])
+        i, j = jumps[k - 1, 0], jumps[k - 1, 1]
+        while i != jumps[k, 0] or j != jumps[k, 1]:
+            i += di
+            j += dj
+            path[p, 0] = i
+            path[p, 1] = j
+            p += 1
+    return path
+
+
+@njit(cache=True)
+def _jps_njit(obstacle, W, start, goal):
+    """
+    Jump Point Search (Harabor & Grastien) para 8 direções com custo
+    uniforme (sem pesos), na variante em que a diagonal é sempre permitida
+    se a célula de destino estiver livre, como em `_astar_kernel`.
+    Só pontos de salto entram na heap; o custo entre dois deles é Octile.
+    `came_from` liga pontos de salto e `_expand_jumps` refaz as retas.
+    Retorna (caminho int32 (n, 2), custo); caminho vazio se não houver solução.
+    """
+    N = obstacle.shape[0]
+    gy = goal // W
+    gx = goal % W
+
+    g_score = np.full(N, np.inf, dtype=np.float32)
+    came_from = np.full(N, -1, dtype=np.int32)
+    heap_f = np.empty(N + 1, dtype=np.float32)
+    heap_g = np.empty(N + 1, dtype=np.float32)
+    heap_pos = np.empty(N + 1, dtype=np.int32)
+    # direções (di, dj) a explorar a partir do nó atual (no máximo 8)
+    dirs = np.empty((8, 2), dtype=np.int64)
+
+    g_score[start] = 0.0
+    h0 = octile((start // W, start % W), (gy, gx))
+    size = _heap_push(
+        heap_f, heap_g, heap_pos, 0, np.float32(h0), np.float32(0.0), start
+    )
+
+    while size > 0:
+        f, current, size = _heap_pop(heap_f, heap_g, heap_pos, size)
+        ci = current // W
+        cj = current - ci * W
+
+        h = octile((ci, cj), (gy, gx))
+        if f > np.float32(g_score[current] + h):
+            continue
+
+        if current == goal:
+            jumps = reconstruct_path(came_from, current, W)
+            return _expand_jumps(jumps), float(g_score[current])
+
+        # Vizinhos podados conforme a direção de chegada
+        n_dirs = 0
+        parent = came_from[current]
+        if parent == -1:
+            for k in range(8):
+                dirs[n_dirs, 0] = _NEIGH8[k, 0]
+                dirs[n_dirs, 1] = _NEIGH8[k, 1]
+                n_dirs += 1
+        else:
+            di = np.sign(ci - parent // W)
+            dj = np.sign(cj - parent % W)
+            if di != 0 and dj != 0:
+                dirs[0, 0], dirs[0, 1] = di, 0
+                dirs[1, 0], dirs[1, 1] = 0, dj
+                dirs[2, 0], dirs[2, 1] = di, dj
+                n_dirs = 3
+                if obstacle[current - dj]:
+                    dirs[n_dirs, 0], dirs[n_dirs, 1] = di, -dj
+                    n_dirs += 1
+                if obstacle[current - di * W]:
+                    dirs[n_dirs, 0], dirs[n_dirs, 1] = -di, dj
+                    n_dirs += 1
+            elif dj != 0:
+                dirs[0, 0], dirs[0, 1] = 0, dj
+                n_dirs = 1
+                if obstacle[current + W]:
+                    dirs[n_dirs, 0], dirs[n_dirs, 1] = 1, dj
+                    n_dirs += 1
+                if obstacle[current - W]:
+                    dirs[n_dirs, 0], dirs[n_dirs, 1] = -1, dj
+                    n_dirs += 1
+            else:
+                dirs[0, 0], dirs[0, 1] = di, 0
+                n_dirs = 1
+                if obstacle[current + 1]:
+                    dirs[n_dirs, 0], dirs[n_dirs, 1] = di, 1
+                    n_dirs += 1
+                if obstacle[current - 1]:
+                    dirs[n_dirs, 0], dirs[n_dirs, 1] = di, -1
+                    n_dirs += 1
+
+        for k in range(n_dirs):
+            di = dirs[k, 0]
+            dj = dirs[k, 1]
+            first = current + di * W + dj
+            if di != 0 and dj != 0:
+                jp = _jump_diagonal(obstacle, W, first, di, dj, goal)
+            else:
+                jp = _jump_straight(obstacle, W, first, di, dj, goal)
+            if jp == -1:
+                continue
+
+            ji = jp // W
+            jj = jp - ji * W
+            tentative_g = np.float32(g_score[current] + octile((ci, cj), (ji, jj)))
+            if tentative_g < g_score[jp]:
+                came_from[jp] = current
+                g_score[jp] = tentative_g
+                h = octile((ji, jj), (gy, gx))
+                if size == heap_f.shape[0]:
+                    heap_f = _grow(heap_f)
+                    heap_g = _grow(heap_g)
+                    heap_pos = _grow(heap_pos)
+                size = _heap_push(
+                    heap_f, heap_g, heap_pos, size,
+                    np.float32(tentative_g + h), tentative_g, jp,
+                )
+
+    return np.empty((0, 2), dtype=np.int32), np.inf
+
+
+@njit(cache=True)
+def _bidir_step(obstacle, weight, W, delta, forward, allow_diag, target,
+                g_this, g_other, came_this, heap_f, heap_g, heap_pos, size,
+                mu, meet):
+    """
+    Expande o melhor nó de uma das frentes da busca bidirecional.
+    O custo de um passo é o peso da célula de destino; na frente reversa
+    o passo real vai do vizinho para o nó atual, então usa o peso do atual.
+    Atualiza `mu` (melhor custo S->E visto) e `meet` (vértice de encontro).
+    Retorna (heap_f, heap_g, heap_pos, size, mu, meet).
+    """
+    n_neigh = 8 if allow_diag else 4
+    tgt = (target // W, target % W)
+
+    f, current, size = _heap_pop(heap_f, heap_g, heap_pos, size)
+    ci = current // W
+    cj = current - ci * W
+    cur = (ci, cj)
+    h = octile(cur, tgt) if allow_diag else manhattan(cur, tgt)
+    if f > np.float32(g_this[current] + h):
+        return heap_f, heap_g, heap_pos, size, mu, meet
 
-    return None
+    for k in range(n_neigh):
+        nb = current + delta[k]
+        if obstacle[nb]:
+            continue
+
+        base = _SQRT2 if k >= 4 else 1.0
+        w = weight[nb] if forward else weight[current]
+        tentative_g = np.float32(g_this[current] + base * w)
+        if tentative_g < g_this[nb]:
+            came_this[nb] = current
+            g_this[nb] = tentative_g
+            total = tentative_g + g_other[nb]
+            if total < mu:
+                mu = total
+                meet = nb
+            npos = (ci + _NEIGH8[k, 0], cj + _NEIGH8[k, 1])
+            h = octile(npos, tgt) if allow_diag else manhattan(npos, tgt)
+            if size == heap_f.shape[0]:
+                heap_f = _grow(heap_f)
+                heap_g = _grow(heap_g)
+                heap_pos = _grow(heap_pos)
+            size = _heap_push(
+                heap_f, heap_g, heap_pos, size,
+                np.float32(tentative_g + h), tentative_g, nb,
+            )
+
+    return heap_f, heap_g, heap_pos, size, mu, meet
+
+
+@njit(cache=True)
+def _bidir_astar_njit(obstacle, weight, W, start, goal, allow_diag):
+    """
+    A* bidirecional: uma frente parte de S (heurística até E) e outra de E
+    (heurística até S); a cada iteração expande a frente com menos entradas
+    na heap. Para quando a menor chave de alguma frente atinge `mu`.
+    Grid achatado e posições em índice plano, como em `_astar_kernel`.
+    Retorna (caminho int32 (n, 2), custo); caminho vazio se não houver solução.
+    """
+    N = obstacle.shape[0]
+    if start == goal:
+        path = np.empty((1, 2), dtype=np.int32)
+        path[0, 0] = start // W
+        path[0, 1] = start % W
+        return path, 0.0
+
+    delta = _neighbor_deltas(W)
+    g_fwd = np.full(N, np.inf, dtype=np.float32)
+    g_bwd = np.full(N, np.inf, dtype=np.float32)
+    came_fwd = np.full(N, -1, dtype=np.int32)
+    came_bwd = np.full(N, -1, dtype=np.int32)
+    heap_f_fwd = np.empty(N + 1, dtype=np.float32)
+    heap_g_fwd = np.empty(N + 1, dtype=np.float32)
+    heap_pos_fwd = np.empty(N + 1, dtype=np.int32)
+    heap_f_bwd = np.empty(N + 1, dtype=np.float32)
+    heap_g_bwd = np.empty(N + 1, dtype=np.float32)
+    heap_pos_bwd = np.empty(N + 1, dtype=np.int32)
+
+    s = (start // W, start % W)
+    e = (goal // W, goal % W)
+    g_fwd[start] = 0.0
+    g_bwd[goal] = 0.0
+    h0 = octile(s, e) if allow_diag else manhattan(s, e)
+    zero = np.float32(0.0)
+    size_fwd = _heap_push(
+        heap_f_fwd, heap_g_fwd, heap_pos_fwd, 0, np.float32(h0), zero, start
+    )
+    size_bwd = _heap_push(
+        heap_f_bwd, heap_g_bwd, heap_pos_bwd, 0, np.float32(h0), zero, goal
+    )
+
+    mu = np.inf
+    meet = -1
+    while size_fwd > 0 and size_bwd > 0:
+        if max(heap_f_fwd[0], heap_f_bwd[0]) >= mu:
+            break
+        if size_fwd <= size_bwd:
+            heap_f_fwd, heap_g_fwd, heap_pos_fwd, size_fwd, mu, meet = _bidir_step(
+                obstacle, weight, W, delta, True, allow_diag, goal,
+                g_fwd, g_bwd, came_fwd, heap_f_fwd, heap_g_fwd, heap_pos_fwd,
+                size_fwd, mu, meet,
+            )
+        else:
+            heap_f_bwd, heap_g_bwd, heap_pos_bwd, size_bwd, mu, meet = _bidir_step(
+                obstacle, weight, W, delta, False, allow_diag, start,
+                g_bwd, g_fwd, came_bwd, heap_f_bwd, heap_g_bwd, heap_pos_bwd,
+                size_bwd, mu, meet,
+            )
+
+    if meet == -1:
+        return np.empty((0, 2), dtype=np.int32), np.inf
+
+    # S..meet pela frente direta, depois meet..E seguindo came_bwd
+    head = reconstruct_path(came_fwd, meet, W)
+    n_tail = 0
+    node = came_bwd[meet]
+    while node != -1:
+        n_tail += 1
+        node = came_bwd[node]
+    path = np.empty((head.shape[0] + n_tail, 2), dtype=np.int32)
+    path[:head.shape[0]] = head
+    k = head.shape[0]
+    node = came_bwd[meet]
+    while node != -1:
+        path[k, 0] = node // W
+        path[k, 1] = node % W
+        k += 1
+        node = came_bwd[node]
+    return path, float(mu)
+
+
+Landmarks = Tuple[np.ndarray, np.ndarray]
+
+# Último conjunto de landmarks calculado: (chave do labirinto, landmarks).
+_landmark_cache: Optional[Tuple[tuple, Landmarks]] = None
+
+
+def precompute_landmarks(
+    obstacle: np.ndarray,
+    weight: np.ndarray,
+    allow_diagonals: bool = False,
+    k: int = 4
+) -> Landmarks:
+    """
+    Escolhe até k landmarks (células livres mais próximas dos cantos e, além
+    de 4, dos pontos médios das bordas) e roda Dijkstra a partir de cada um.
+    Retorna (dist_from, dist_to), float32 (k, H, W): d(L, v) e d(v, L).
+    """
+    H, W = obstacle.shape
+    free = np.argwhere(obstacle == 0)
+    anchors = [
+        (0, 0), (H - 1, W - 1), (0, W - 1), (H - 1, 0),
+        (0, W // 2), (H - 1, W // 2), (H // 2, 0), (H // 2, W - 1),
+    ]
+    chosen: List[Pos] = []
+    for a in anchors[:k]:
+        if free.shape[0] == 0:
+            break
+        idx = int(np.abs(free - np.array(a)).sum(axis=1).argmin())
+        p = (int(free[idx, 0]), int(free[idx, 1]))
+        if p not in chosen:
+            chosen.append(p)
+
+    obs, wgt = obstacle.ravel(), weight.ravel()
+    dist_from = np.empty((len(chosen), H, W), dtype=np.float32)
+    dist_to = np.empty((len(chosen), H, W), dtype=np.float32)
+    for l, (i, j) in enumerate(chosen):
+        src = i * W + j
+        dist_from[l] = _dijkstra_njit(
+            obs, wgt, W, src, allow_diagonals, False
+        ).reshape(H, W)
+        dist_to[l] = _dijkstra_njit(
+            obs, wgt, W, src, allow_diagonals, True
+        ).reshape(H, W)
+    return dist_from, dist_to
+
+
+def cached_landmarks(
+    obstacle: np.ndarray,
+    weight: np.ndarray,
+    allow_diagonals: bool = False,
+    k: int = 4
+) -> Landmarks:
+    """
+    Igual a `precompute_landmarks`, mas reaproveita o último resultado
+    enquanto o labirinto (obstáculos e pesos), o modo e k forem os mesmos.
+    """
+    global _landmark_cache
+    key = (obstacle.shape, obstacle.tobytes(), weight.tobytes(), allow_diagonals, k)
+    if _landmark_cache is None or _landmark_cache[0] != key:
+        _landmark_cache = (
+            key, precompute_landmarks(obstacle, weight, allow_diagonals, k)
+        )
+    return _landmark_cache[1]
+
+
+def a_star_grid(
+    obstacle: np.ndarray,
+    weight: np.ndarray,
+    start: Pos,
+    goal: Pos,
+    allow_diagonals: bool = False,
+    landmarks: Optional[Landmarks] = None
+) -> Optional[Tuple[List[Pos], float]]:
+    """
+    A* sobre o labirinto codificado por `encode_lab`: executa o kernel
+    adequado e converte o caminho para lista de tuplas. Posições (start,
+    goal e caminho) são coordenadas do grid codificado, com borda.
+      - 4 direções sem pesos (todo passo custa 1) e sem landmarks: fila de
+        baldes (`_astar_buckets_njit`).
+      - 8 direções sem pesos e sem landmarks: Jump Point Search (`_jps_njit`).
+      - Demais casos: heap binária (`_astar_njit_4` / `_astar_njit_8`), com
+        heurística ALT se `landmarks` (de `precompute_landmarks`) for
+        informado.
+    Retorna (caminho, custo_total) ou None.
+    """
+    # Conversão (i, j) <-> índice plano só aqui, na fronteira com os kernels
+    W = obstacle.shape[1]
+    s, g = start[0] * W + start[1], goal[0] * W + goal[1]
+    uniform = landmarks is None and (weight == 1.0).all()
+    if uniform and not allow_diagonals:
+        path, cost = _astar_buckets_njit(obstacle.ravel(), W, s, g)
+    elif uniform:
+        path, cost = _jps_njit(obstacle.ravel(), W, s, g)
+    else:
+        if landmarks is None:
+            empty = np.empty((0, obstacle.size), dtype=np.float32)
+            lm_from, lm_to = empty, empty
+        else:
+            lm_from = landmarks[0].reshape(landmarks[0].shape[0], obstacle.size)
+            lm_to = landmarks[1].reshape(landmarks[1].shape[0], obstacle.size)
+        kernel = _astar_njit_8 if allow_diagonals else _astar_njit_4
+        path, cost = kernel(
+            obstacle.ravel(), weight.ravel(), W, s, g, lm_from, lm_to
+        )
+    return _to_result(path, cost)
+
+
+def _to_result(
+    path: np.ndarray, cost: float
+) -> Optional[Tuple[List[Pos], float]]:
+    """Converte a saída dos kernels em (caminho, custo_total) ou None."""
+    if path.shape[0] == 0:
+        return None
+    return [(i, j) for i, j in path.tolist()], cost
+
+
+def _strip_border(
+    result: Optional[Tuple[List[Pos], float]]
+) -> Optional[Tuple[List[Pos], float]]:
+    """Converte o caminho do grid com borda para coordenadas do labirinto."""
+    if result is None:
+        return None
+    path, cost = result
+    return [(i - 1, j - 1) for i, j in path], cost
+
+
+def a_star(
+    lab: List[List[str]],
+    allow_diagonals: bool = False,
+    use_landmarks: bool = False
+) -> Optional[Tuple[List[Pos], float]]:
+    """
+    A* com:
+      - Heurística: Manhattan (4-dir) ou Octile (8-dir).
+      - g_score com heap; evita varrer heap para updates.
+      - Suporte a pesos em '2'..'9'.
+      - use_landmarks=True: heurística ALT com landmarks em cache, útil
+        para várias consultas sobre o mesmo labirinto.
+    Codifica o labirinto com `encode_lab` e delega para `a_star_grid`.
+    Retorna (caminho, custo_total) ou None.
+    """
+    obstacle, weight, start, goal = encode_lab(lab)
+    landmarks = None
+    if use_landmarks:
+        landmarks = cached_landmarks(obstacle, weight, allow_diagonals)
+    return _strip_border(
+        a_star_grid(obstacle, weight, start, goal, allow_diagonals, landmarks)
+    )
+
+
+def a_star_bidir(
+    lab: List[List[str]],
+    allow_diagonals: bool = False
+) -> Optional[Tuple[List[Pos], float]]:
+    """
+    Variante bidirecional do A* (buscas a partir de S e de E que se
+    encontram no meio); útil em labirintos grandes com caminhos longos.
+    Mesmas regras e mesmo retorno de `a_star`.
+    """
+    obstacle, weight, start, goal = encode_lab(lab)
+    W = obstacle.shape[1]
+    path, cost = _bidir_astar_njit(
+        obstacle.ravel(), weight.ravel(), W,
+        start[0] * W + start[1], goal[0] * W + goal[1], allow_diagonals,
+    )
+    return _strip_border(_to_result(path, cost))
 
 
 def print_labyrinth(lab: List[List[str]]):
@@ -252,16 +978,16 @@ def read_user_labyrinth() -> List[List[str]]:
     lab: List[List[str]] = []
     print(f"\nDigite cada linha com {colunas} elementos separados por espaço.")
     print("Ex.: S 0 1 0 E  ou  S 0 # 0 E  ou  S 0 2 0 E")
-    valid = set(list("SE0#") + [str(d) for d in range(0, 10)])
     for i in range(linhas):
         while True:
-            linha = input(f"Linha {i+1}: ").strip().upper().split()
+            entrada = input(f"Linha {i+1}: ").upper()
+            if not _LINE_RE.fullmatch(entrada):
+                print("ERRO: use apenas S, E, 0, 1, #, 2..9.")
+                continue
+            linha = _TOKEN_RE.findall(entrada)
             if len(linha) != colunas:
                 print(f"ERRO: precisa ter exatamente {colunas} elementos.")
                 continue
-            if not all(token in valid for token in linha):
-                print("ERRO: use apenas S, E, 0, 1, #, 2..9.")
-                continue
             lab.append(linha)
             break
 
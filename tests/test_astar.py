@@ -0,0 +1,146 @@
+"""
+Testes de regressão: compara os kernels de `main` (baldes, JPS, heap, ALT e
+bidirecional) com um Dijkstra simples em labirintos aleatórios com semente.
+
+Executar a partir da raiz do projeto: python -m unittest discover tests
+"""
+
+import heapq
+import math
+import random
+import unittest
+
+import main
+
+_OFF4 = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+_OFF8 = _OFF4 + [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+
+
+def _step_weight(cell):
+    return float(cell) if cell in "23456789" else 1.0
+
+
+def _dijkstra(lab, diag):
+    """Custo mínimo de S até E (None se inalcançável), sem heurística."""
+    H, W = len(lab), len(lab[0])
+    s, e = main.find_unique_positions(lab)
+    dist = {s: 0.0}
+    pq = [(0.0, s)]
+    while pq:
+        d, (i, j) = heapq.heappop(pq)
+        if d > dist[(i, j)]:
+            continue
+        if (i, j) == e:
+            return d
+        for di, dj in _OFF8 if diag else _OFF4:
+            ni, nj = i + di, j + dj
+            if not (0 <= ni < H and 0 <= nj < W) or lab[ni][nj] in "1#":
+                continue
+            base = math.sqrt(2) if di and dj else 1.0
+            nd = d + base * _step_weight(lab[ni][nj])
+            if nd < dist.get((ni, nj), math.inf):
+                dist[(ni, nj)] = nd
+                heapq.heappush(pq, (nd, (ni, nj)))
+    return None
+
+
+def _path_cost(lab, path, diag):
+    """Valida o caminho (S..E, passos adjacentes e livres) e devolve o custo."""
+    H, W = len(lab), len(lab[0])
+    assert lab[path[0][0]][path[0][1]] == "S"
+    assert lab[path[-1][0]][path[-1][1]] == "E"
+    cost = 0.0
+    for (i, j), (ni, nj) in zip(path, path[1:]):
+        di, dj = abs(ni - i), abs(nj - j)
+        assert max(di, dj) == 1 and (diag or di + dj == 1), ((i, j), (ni, nj))
+        assert 0 <= ni < H and 0 <= nj < W and lab[ni][nj] not in "1#"
+        base = math.sqrt(2) if di and dj else 1.0
+        cost += base * _step_weight(lab[ni][nj])
+    return cost
+
+
+def _random_lab(rng, H, W, p_obstacle, weighted):
+    lab = [
+        [
+            "1" if rng.random() < p_obstacle
+            else str(rng.randint(2, 9)) if weighted and rng.random() < 0.2
+            else "0"
+            for _ in range(W)
+        ]
+        for _ in range(H)
+    ]
+    (si, sj), (ei, ej) = rng.sample([(i, j) for i in range(H) for j in range(W)], 2)
+    lab[si][sj] = "S"
+    lab[ei][ej] = "E"
+    return lab
+
+
+class AStarAgainstDijkstra(unittest.TestCase):
+    """Custo ótimo e caminho válido em todas as variantes de busca."""
+
+    CASES = 400
+
+    def _check(self, solve, seed):
+        rng = random.Random(seed)
+        for _ in range(self.CASES):
+            H, W = rng.randint(1, 24), rng.randint(2, 24)
+            weighted = rng.random() < 0.5
+            lab = _random_lab(rng, H, W, rng.random() * 0.45, weighted)
+            for diag in (False, True):
+                expected = _dijkstra(lab, diag)
+                result = solve(lab, diag)
+                msg = (lab, diag)
+                if expected is None:
+                    self.assertIsNone(result, msg)
+                    continue
+                self.assertIsNotNone(result, msg)
+                path, cost = result
+                self.assertAlmostEqual(cost, expected, places=3, msg=msg)
+                self.assertAlmostEqual(
+                    _path_cost(lab, path, diag), expected, places=3, msg=msg
+                )
+
+    def test_a_star(self):
+        # Sem pesos: baldes (4 dir.) e JPS (8 dir.); com pesos: heap binária
+        self._check(lambda lab, d: main.a_star(lab, allow_diagonals=d), seed=1)
+
+    def test_a_star_landmarks(self):
+        self._check(
+            lambda lab, d: main.a_star(lab, allow_diagonals=d, use_landmarks=True),
+            seed=2,
+        )
+
+    def test_a_star_bidir(self):
+        self._check(lambda lab, d: main.a_star_bidir(lab, allow_diagonals=d), seed=3)
+
+    def test_a_star_grid_without_landmarks(self):
+        # k = 0: arrays (0, H, W); o kernel deve cair na heurística base
+        def solve(lab, diag):
+            obstacle, weight, start, goal = main.encode_lab(lab)
+            landmarks = main.precompute_landmarks(obstacle, weight, diag, k=0)
+            result = main.a_star_grid(obstacle, weight, start, goal, diag, landmarks)
+            if result is None:
+                return None
+            path, cost = result
+            return [(i - 1, j - 1) for i, j in path], cost
+
+        self._check(solve, seed=4)
+
+
+class InputValidation(unittest.TestCase):
+
+    def test_rejects_multi_character_cells(self):
+        with self.assertRaises(ValueError):
+            main.a_star([["S", "ab", ""], ["E", "0", "0"]])
+
+    def test_rejects_ragged_rows(self):
+        with self.assertRaises(ValueError):
+            main.a_star([["S", "0"], ["E"]])
+
+    def test_requires_single_start_and_end(self):
+        with self.assertRaises(ValueError):
+            main.a_star([["S", "S"], ["E", "0"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,10 @@
-import curses
 import time
 from typing import List, Tuple
 
 Pos = Tuple[int, int]
 
+curses = None  # módulo curses, carregado por run_curses_animation
+
 SYMBOLS = {
     'robot': 'R',
     'free': ' ',
@@ -21,6 +22,10 @@ COLORS = {
     'text': 7,
 }
 
+# Canto superior esquerdo do labirinto na tela (linha 0 é o cabeçalho)
+GRID_TOP = 1
+GRID_LEFT = 2
+
 
 def _init_colors():
     curses.start_color()
@@ -44,54 +49,52 @@ def _cell_repr(cell: str) -> str:
     return cell
 
 
-def _draw_grid(stdscr, lab: List[List[str]], path: List[Pos], robot_idx: int):
-    h, w = stdscr.getmaxyx()
+def _color_for(cell: str) -> int:
+    ch = _cell_repr(cell)
+    if ch == 'S':
+        return curses.color_pair(COLORS['start'])
+    if ch == 'E':
+        return curses.color_pair(COLORS['goal'])
+    if ch == SYMBOLS['wall']:
+        return curses.color_pair(COLORS['wall'])
+    if ch.isdigit() and ch not in ('0'):
+        return curses.color_pair(COLORS['weight'])
+    return 0
+
+
+def _background(lab: List[List[str]]) -> List[Tuple[int, int, str, int]]:
+    # Fundo estático (y, x, caractere, cor), calculado uma vez por animação
     rows, cols = len(lab), len(lab[0]) if lab else 0
+    return [
+        (GRID_TOP + i, GRID_LEFT + j * 2, _cell_repr(lab[i][j]), _color_for(lab[i][j]))
+        for i in range(rows)
+        for j in range(cols)
+    ]
+
 
-    top = 1
-    left = 2
+def _draw_grid(stdscr, lab: List[List[str]], bg: List[Tuple[int, int, str, int]],
+               path: List[Pos], robot_idx: int):
+    h, w = stdscr.getmaxyx()
 
     header = "Curses PathFinder (q = sair, +/- = velocidade)"
     stdscr.attron(curses.color_pair(COLORS['text']))
     stdscr.addstr(0, max(0, (w - len(header)) // 2), header)
     stdscr.attroff(curses.color_pair(COLORS['text']))
 
-    for i in range(rows):
-        for j in range(cols):
-            ch = _cell_repr(lab[i][j])
-            color = 0
-            if ch == 'S':
-                color = curses.color_pair(COLORS['start'])
-            elif ch == 'E':
-                color = curses.color_pair(COLORS['goal'])
-            elif ch == SYMBOLS['wall']:
-                color = curses.color_pair(COLORS['wall'])
-            elif ch.isdigit() and ch not in ('0'):
-                color = curses.color_pair(COLORS['weight'])
-
-            y = top + i
-            x = left + j * 2
-            stdscr.attron(color)
-            stdscr.addstr(y, x, ch)
-            stdscr.attroff(color)
+    for y, x, ch, color in bg:
+        stdscr.addstr(y, x, ch, color)
 
+    path_color = curses.color_pair(COLORS['path'])
     for k in range(1, min(robot_idx + 1, len(path))):
         i, j = path[k]
         if lab[i][j] in ('S', 'E'):
             continue
-        y = top + i
-        x = left + j * 2
-        stdscr.attron(curses.color_pair(COLORS['path']))
-        stdscr.addstr(y, x, SYMBOLS['path'])
-        stdscr.attroff(curses.color_pair(COLORS['path']))
+        stdscr.addstr(GRID_TOP + i, GRID_LEFT + j * 2, SYMBOLS['path'], path_color)
 
     if 0 <= robot_idx < len(path):
         ri, rj = path[robot_idx]
-        y = top + ri
-        x = left + rj * 2
-        stdscr.attron(curses.color_pair(COLORS['robot']))
-        stdscr.addstr(y, x, SYMBOLS['robot'])
-        stdscr.attroff(curses.color_pair(COLORS['robot']))
+        stdscr.addstr(GRID_TOP + ri, GRID_LEFT + rj * 2, SYMBOLS['robot'],
+                      curses.color_pair(COLORS['robot']))
 
 
 def _animate(stdscr, lab: List[List[str]], path: List[Pos], delay_ms: int):
@@ -99,11 +102,12 @@ def _animate(stdscr, lab: List[List[str]], path: List[Pos], delay_ms: int):
     stdscr.nodelay(True)
     stdscr.timeout(delay_ms)
     _init_colors()
+    bg = _background(lab)
 
     idx = 0
     while True:
         stdscr.erase()
-        _draw_grid(stdscr, lab, path, idx)
+        _draw_grid(stdscr, lab, bg, path, idx)
         # Rodapé
         msg = f"passo {idx+1}/{len(path)} | delay={delay_ms}ms"
         h, w = stdscr.getmaxyx()
@@ -135,4 +139,8 @@ def _animate(stdscr, lab: List[List[str]], path: List[Pos], delay_ms: int):
 
 
 def run_curses_animation(lab: List[List[str]], path: List[Pos], delay_ms: int = 120):
+    # curses só é importado aqui: carregar o módulo não exige terminal/curses
+    global curses
+    import curses
+
     curses.wrapper(_animate, lab, path, delay_ms)